@@ -6,8 +6,25 @@ API增强脚本：为期权数据添加股价、执行价格和到期日信息
 
 import re
 import futu as ft
+from contextlib import contextmanager
 from datetime import datetime
 
+@contextmanager
+def quote_context():
+    """
+    打开一个行情连接，退出时自动关闭
+    
+    批量查询时在同一个连接上完成，避免每次查询都重新建立OpenD连接：
+        with quote_context() as quote_ctx:
+            for option in options:
+                enhance_option_data(option, quote_ctx)
+    """
+    quote_ctx = ft.OpenQuoteContext(host='127.0.0.1', port=11111)
+    try:
+        yield quote_ctx
+    finally:
+        quote_ctx.close()
+
 def parse_option_code(option_code):
     """从期权代码解析执行价格和到期日"""
     try:
@@ -42,12 +59,14 @@ def parse_option_code(option_code):
         'option_type': '未知'
     }
 
-def get_stock_price(stock_code):
-    """获取股票当前价格"""
+def get_stock_price(stock_code, quote_ctx=None):
+    """获取股票当前价格（未传入quote_ctx时临时打开一个连接）"""
     try:
-        quote_ctx = ft.OpenQuoteContext(host='127.0.0.1', port=11111)
-        ret, data = quote_ctx.get_market_snapshot([stock_code])
-        quote_ctx.close()
+        if quote_ctx is None:
+            with quote_context() as quote_ctx:
+                ret, data = quote_ctx.get_market_snapshot([stock_code])
+        else:
+            ret, data = quote_ctx.get_market_snapshot([stock_code])
         
         if ret == ft.RET_OK and not data.empty:
             return float(data.iloc[0]['last_price'])
@@ -56,15 +75,15 @@ def get_stock_price(stock_code):
     
     return 0
 
-def enhance_option_data(option):
-    """增强单个期权数据"""
+def enhance_option_data(option, quote_ctx=None):
+    """增强单个期权数据（批量处理时传入同一个quote_ctx复用连接）"""
     # 解析期权代码获取缺失信息
     option_code = option.get('option_code', '')
     parsed_info = parse_option_code(option_code)
     
     # 获取股价
     stock_code = option.get('stock_code', '')
-    stock_price = get_stock_price(stock_code)
+    stock_price = get_stock_price(stock_code, quote_ctx)
     
     # 合并所有信息
     enhanced_option = {
@@ -81,10 +100,11 @@ if __name__ == "__main__":
     # 测试解析功能
     test_codes = ["HK.ALB250905C95000", "HK.ALB250905C92500"]
     
-    for code in test_codes:
-        parsed = parse_option_code(code)
-        print(f"{code} -> 执行价格: {parsed['strike_price']}, 到期日: {parsed['expiry_date']}, 类型: {parsed['option_type']}")
-        
-        # 测试股价获取
-        stock_price = get_stock_price("HK.09988")
-        print(f"HK.09988 股价: {stock_price}")
\ No newline at end of file
+    with quote_context() as quote_ctx:
+        for code in test_codes:
+            parsed = parse_option_code(code)
+            print(f"{code} -> 执行价格: {parsed['strike_price']}, 到期日: {parsed['expiry_date']}, 类型: {parsed['option_type']}")
+            
+            # 测试股价获取
+            stock_price = get_stock_price("HK.09988", quote_ctx)
+            print(f"HK.09988 股价: {stock_price}")
\ No newline at end of file
@@ -45,6 +45,8 @@ class OptionMonitor:
         self.quote_ctx = None
         self.is_running = False
         self.monitor_thread = None
+        self._stop_event = threading.Event()  # 停止信号，用于及时唤醒监控循环
+        self._state_lock = threading.Lock()  # 保护启动/停止状态切换
         self.subscribed_options = set()  # 已订阅的期权代码
         self.stock_price_cache = {}  # 股价缓存
         self.price_update_time = {}  # 股价更新时间
@@ -572,6 +574,9 @@ class OptionMonitor:
     
     def _process_large_trades(self, stock_code: str, trades_df: pd.DataFrame):
         """处理发现的大单交易"""
+        # 同一批交易共用一次当前时间
+        now = datetime.now()
+        today = now.strftime('%Y-%m-%d')
         for _, trade in trades_df.iterrows():
             # 规范化成交时间
             try:
@@ -579,9 +584,9 @@ class OptionMonitor:
                 if (len(t_str) >= 10 and ('-' in t_str or '/' in t_str)):
                     time_full = t_str.split('.')[0]
                 else:
-                    time_full = f"{datetime.now().strftime('%Y-%m-%d')} {t_str}"
+                    time_full = f"{today} {t_str}"
             except Exception:
-                time_full = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                time_full = now.strftime('%Y-%m-%d %H:%M:%S')
 
             trade_info = {
                 'stock_code': stock_code,
@@ -637,8 +642,8 @@ class OptionMonitor:
                     self._update_option_subscriptions()
                     subscription_update_counter = 0
                 
-                # 等待下一次监控 (1分钟)
-                time.sleep(MONITOR_TIME['interval'])
+                # 等待下一次监控，收到停止信号时立即退出
+                self._stop_event.wait(MONITOR_TIME['interval'])
                 
             except KeyboardInterrupt:
                 self.logger.info("收到停止信号")
@@ -646,7 +651,7 @@ class OptionMonitor:
             except Exception as e:
                 self.logger.error(f"监控循环异常: {e}")
                 self.logger.error(traceback.format_exc())
-                time.sleep(10)  # 异常后等待10秒再继续
+                self._stop_event.wait(10)  # 异常后等待10秒再继续
     
     def _quick_options_check(self):
         """快速期权检查 - 1分钟间隔"""
@@ -680,6 +685,9 @@ class OptionMonitor:
                         for option_code in check_codes:
                             trades_df = self.get_option_trades(option_code)
                             if trades_df is not None and not trades_df.empty:
+                                # 同一批交易共用一次当前时间
+                                now = datetime.now()
+                                today = now.strftime('%Y-%m-%d')
                                 # 发现大单，立即通知
                                 for _, trade in trades_df.iterrows():
                                     # 规范化成交时间
@@ -688,9 +696,9 @@ class OptionMonitor:
                                         if (len(t_str) >= 10 and ('-' in t_str or '/' in t_str)):
                                             time_full = t_str.split('.')[0]
                                         else:
-                                            time_full = f"{datetime.now().strftime('%Y-%m-%d')} {t_str}"
+                                            time_full = f"{today} {t_str}"
                                     except Exception:
-                                        time_full = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                                        time_full = now.strftime('%Y-%m-%d %H:%M:%S')
 
                                     trade_info = {
                                         'stock_code': stock_code,
@@ -872,14 +880,21 @@ class OptionMonitor:
     
     def start_monitoring(self):
         """启动监控"""
-        if self.is_running:
-            self.logger.warning("监控已在运行中")
-            return
-        
-        self.is_running = True
-        self.monitor_thread = threading.Thread(target=self._monitor_loop)
-        self.monitor_thread.daemon = True
-        self.monitor_thread.start()
+        with self._state_lock:
+            if self.is_running:
+                self.logger.warning("监控已在运行中")
+                return
+            
+            # stop_monitoring只等待5秒，旧线程可能仍在执行耗时检查，此时不能再启动新线程
+            if self.monitor_thread is not None and self.monitor_thread.is_alive():
+                self.logger.warning("上一个监控线程尚未退出，请稍后再启动")
+                return
+            
+            self.is_running = True
+            self._stop_event.clear()
+            self.monitor_thread = threading.Thread(target=self._monitor_loop)
+            self.monitor_thread.daemon = True
+            self.monitor_thread.start()
         
         self.logger.info("期权大单监控已启动")
     
@@ -973,7 +988,9 @@ class OptionMonitor:
     
     def stop_monitoring(self):
         """停止监控"""
-        self.is_running = False
+        with self._state_lock:
+            self.is_running = False
+            self._stop_event.set()
         if self.monitor_thread and self.monitor_thread.is_alive():
             self.monitor_thread.join(timeout=5)
         
@@ -1082,6 +1099,10 @@ class OptionTickerHandler(ft.TickerHandlerBase):
         # 获取期权代码
         option_code = data['code'].iloc[0]
         
+        # 同一次推送的逐笔共用一次当前时间
+        now = datetime.now()
+        today = now.strftime('%Y-%m-%d')
+        
         # 筛选大单
         for _, row in data.iterrows():
             volume = row.get("volume", 0)
@@ -1097,9 +1118,9 @@ class OptionTickerHandler(ft.TickerHandlerBase):
                     if (len(t_str) >= 10 and ('-' in t_str or '/' in t_str)):
                         time_full = t_str.split('.')[0]
                     else:
-                        time_full = f"{datetime.now().strftime('%Y-%m-%d')} {t_str}"
+                        time_full = f"{today} {t_str}"
                 except Exception:
-                    time_full = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    time_full = now.strftime('%Y-%m-%d %H:%M:%S')
 
                 # 构建交易信息
                 trade_info = {
@@ -1110,7 +1131,7 @@ class OptionTickerHandler(ft.TickerHandlerBase):
                     'volume': volume,
                     'turnover': turnover,
                     'direction': row.get('ticker_direction', 'Unknown'),
-                    'timestamp': datetime.now()
+                    'timestamp': now
                 }
                 
                 # 获取对应的股票代码
@@ -4,18 +4,57 @@
 """
 
 import pandas as pd
+import numpy as np
+import io
 import os
+import csv
+import atexit
 import logging
-from typing import Dict
+import threading
+from collections import deque
+from typing import Dict, List
 from config import DATA_CONFIG
 
 
+# CSV列顺序（各处构造的trade_info字段顺序不一致，统一按此顺序写入）
+TRADE_COLUMNS = [
+    'stock_code', 'option_code', 'time', 'time_full', 'price',
+    'volume', 'turnover', 'direction', 'timestamp'
+]
+
+
 class DataHandler:
     """数据处理器"""
     
     def __init__(self):
         self.logger = logging.getLogger('OptionMonitor.DataHandler')
+        self.batch_size = DATA_CONFIG.get('csv_batch_size', 128)  # 攒够多少笔写一次盘
+        self.flush_interval = DATA_CONFIG.get('flush_interval', 5)  # 定时写盘间隔(秒)
+        self.max_buffer_size = DATA_CONFIG.get('csv_max_buffer', 10000)  # 缓冲上限，写盘持续失败时丢弃最旧的交易
+        self._csv_buffer = deque(maxlen=self.max_buffer_size)  # 待写入CSV的交易缓冲
+        self._csv_lock = threading.Lock()  # 保护缓冲区
+        self._csv_write_lock = threading.Lock()  # 保证批次按顺序写盘
+        self._csv_fh = None  # 常驻的CSV追加写文件句柄（首次写盘时打开）
+        self._csv_writer = None
+        self.db_batch_size = DATA_CONFIG.get('db_batch_size', 200)  # 攒够多少笔写一次数据库
+        self._db_buffer: List[Dict] = []  # 待写入数据库的交易缓冲
+        self._db_lock = threading.Lock()
+        self._flush_thread = None
+        self._activity_event = threading.Event()  # 有新交易进入缓冲时置位，空闲时写盘线程不轮询
+        self._batch_full_event = threading.Event()  # 缓冲攒满一批时置位，唤醒写盘线程立即写出
+        self._history_df = None  # 已解析的历史数据
+        self._history_header = b''  # 解析时的CSV表头行
+        self._history_offset = 0  # 已解析到的文件字节偏移
+        self._history_lock = threading.Lock()
         self._ensure_data_directory()
+        
+        # 启动时确定一次CSV表头状态，之后写盘不再逐次stat文件
+        csv_path = DATA_CONFIG['csv_path']
+        self._csv_fieldnames = self._read_csv_header(csv_path) or TRADE_COLUMNS
+        self._csv_header_written = os.path.exists(csv_path) and os.path.getsize(csv_path) > 0
+        
+        # 进程退出时写出剩余缓冲，避免丢失交易
+        atexit.register(self.close)
     
     def _ensure_data_directory(self):
         """确保数据目录存在"""
@@ -30,31 +69,135 @@ class DataHandler:
             self._save_to_csv(trade_info)
         
         if DATA_CONFIG['save_to_db']:
-            self._save_to_database(trade_info)
-    
-    def _save_to_csv(self, trade_info: Dict):
-        """保存到CSV文件"""
-        try:
-            csv_path = DATA_CONFIG['csv_path']
+            with self._db_lock:
+                self._db_buffer.append(trade_info)
+                buffered = len(self._db_buffer)
             
-            # 准备数据
-            df_new = pd.DataFrame([trade_info])
-            
-            # 如果文件存在，追加数据；否则创建新文件
-            if os.path.exists(csv_path):
-                df_new.to_csv(csv_path, mode='a', header=False, index=False, encoding='utf-8')
-            else:
-                df_new.to_csv(csv_path, mode='w', header=True, index=False, encoding='utf-8')
+            self._activity_event.set()
+            self._start_flush_thread()
             
-            self.logger.debug(f"交易数据已保存到CSV: {trade_info['option_code']}")
+            if buffered >= self.db_batch_size:
+                self._batch_full_event.set()
+    
+    def flush(self):
+        """写出所有缓冲中的交易"""
+        self._flush_csv()
+        self._flush_db()
+    
+    def close(self):
+        """写出所有缓冲并关闭CSV文件"""
+        self.flush()
+        with self._csv_write_lock:
+            if self._csv_fh is not None:
+                self._csv_fh.close()
+                self._csv_fh = None
+                self._csv_writer = None
+    
+    def _save_to_csv(self, trade_info: Dict):
+        """加入CSV写入缓冲，由后台线程攒够一批或定时写盘"""
+        with self._csv_lock:
+            overflow = len(self._csv_buffer) >= self.max_buffer_size
+            self._csv_buffer.append(trade_info)
+            buffered = len(self._csv_buffer)
+        
+        if overflow:
+            self.logger.warning("CSV写入缓冲已满(%s条)，丢弃最旧的交易", self.max_buffer_size)
+        
+        self._activity_event.set()
+        self._start_flush_thread()
+        
+        if buffered >= self.batch_size:
+            self._batch_full_event.set()
+    
+    def _start_flush_thread(self):
+        """启动后台定时写盘线程（首次保存时启动）"""
+        if self._flush_thread is not None:
+            return
+        with self._csv_lock:
+            if self._flush_thread is None:
+                self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+                self._flush_thread.start()
+    
+    def _flush_loop(self):
+        """后台写盘循环：攒满一批立即写出，否则最多等待flush_interval秒；无交易时阻塞等待"""
+        while True:
+            self._activity_event.wait()
+            self._activity_event.clear()
+            self._batch_full_event.wait(self.flush_interval)
+            self._batch_full_event.clear()
+            self.flush()
+    
+    def _flush_csv(self):
+        """将缓冲中的交易一次性追加写入CSV文件"""
+        with self._csv_write_lock:
+            with self._csv_lock:
+                if not self._csv_buffer:
+                    return
+                rows = list(self._csv_buffer)
+                self._csv_buffer.clear()
             
+            try:
+                if self._csv_writer is None:
+                    self._csv_fh = open(DATA_CONFIG['csv_path'], 'a', buffering=1 << 16, newline='', encoding='utf-8')
+                    self._csv_writer = csv.DictWriter(self._csv_fh, fieldnames=self._csv_fieldnames,
+                                                      extrasaction='ignore', lineterminator='\n')  # 与旧版pandas写入的换行符一致
+                
+                # 新文件才写表头
+                if not self._csv_header_written:
+                    self._csv_writer.writeheader()
+                    self._csv_header_written = True
+                self._csv_writer.writerows(rows)
+                self._csv_fh.flush()
+                
+                self.logger.debug("已批量保存 %s 条交易数据到CSV", len(rows))
+                
+            except Exception as e:
+                self.logger.error("保存CSV数据失败: %s", e)
+                # 文件句柄可能已损坏（如磁盘写满），关闭后下次写盘重新打开
+                if self._csv_fh is not None:
+                    try:
+                        self._csv_fh.close()
+                    except Exception:
+                        pass
+                self._csv_fh = None
+                self._csv_writer = None
+                # 写盘失败时放回缓冲头部，等下次写盘重试；超出上限时丢弃最旧的交易
+                with self._csv_lock:
+                    merged = rows + list(self._csv_buffer)
+                    dropped = max(len(merged) - self.max_buffer_size, 0)
+                    self._csv_buffer.clear()
+                    self._csv_buffer.extend(merged[dropped:])
+                
+                if dropped:
+                    self.logger.warning("CSV写入缓冲已满(%s条)，丢弃最旧的 %s 笔交易", self.max_buffer_size, dropped)
+                
+                # 唤醒写盘线程，flush_interval秒后重试
+                self._activity_event.set()
+    
+    def _read_csv_header(self, csv_path: str) -> List[str]:
+        """读取已有CSV文件的表头，兼容旧文件的列顺序"""
+        if not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0:
+            return []
+        with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+            return next(csv.reader(f), [])
+    
+    def _flush_db(self):
+        """将缓冲中的交易整批写入数据库"""
+        with self._db_lock:
+            if not self._db_buffer:
+                return
+            rows = self._db_buffer
+            self._db_buffer = []
+        
+        try:
+            self._save_to_database(rows)
         except Exception as e:
-            self.logger.error(f"保存CSV数据失败: {e}")
+            self.logger.error("保存数据库数据失败: %s", e)
     
-    def _save_to_database(self, trade_info: Dict):
-        """保存到数据库（可扩展）"""
-        # 这里可以实现数据库存储逻辑
-        # 例如：SQLite, MySQL, PostgreSQL等
+    def _save_to_database(self, trades: List[Dict]):
+        """批量保存到数据库（可扩展）"""
+        # 这里可以实现数据库存储逻辑，一批交易应在一次事务中批量写入
+        # 例如：SQLite executemany, MySQL 多行INSERT 等
         pass
     
     def load_historical_data(self, days: int = 7) -> pd.DataFrame:
@@ -63,10 +206,11 @@ class DataHandler:
             if not DATA_CONFIG['save_to_csv'] or not os.path.exists(DATA_CONFIG['csv_path']):
                 return pd.DataFrame()
             
-            df = pd.read_csv(DATA_CONFIG['csv_path'], encoding='utf-8')
+            with self._history_lock:
+                df = self._read_new_history(DATA_CONFIG['csv_path'])
             
-            # 转换时间戳
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            if df.empty:
+                return df
             
             # 筛选最近几天的数据
             cutoff_date = pd.Timestamp.now() - pd.Timedelta(days=days)
@@ -75,9 +219,38 @@ class DataHandler:
             return recent_data
             
         except Exception as e:
-            self.logger.error(f"加载历史数据失败: {e}")
+            self.logger.error("加载历史数据失败: %s", e)
             return pd.DataFrame()
     
+    def _read_new_history(self, csv_path: str) -> pd.DataFrame:
+        """增量解析CSV：只解析上次读取之后追加的完整行，文件被重写时全量重读"""
+        with open(csv_path, 'rb') as f:
+            header = f.readline()
+            if header != self._history_header or os.fstat(f.fileno()).st_size < self._history_offset:
+                self._history_df = None
+                self._history_header = header
+                self._history_offset = len(header)
+            
+            f.seek(self._history_offset)
+            chunk = f.read()
+        
+        # 只处理到最后一个换行符，末尾可能是正在写入的半行
+        end = chunk.rfind(b'\n') + 1
+        if end > 0:
+            new_df = pd.read_csv(io.BytesIO(header + chunk[:end]), encoding='utf-8')
+            # 转换时间戳
+            new_df['timestamp'] = pd.to_datetime(new_df['timestamp'])
+            
+            if self._history_df is None or self._history_df.empty:
+                self._history_df = new_df
+            else:
+                self._history_df = pd.concat([self._history_df, new_df], ignore_index=True)
+            self._history_offset += end
+        
+        if self._history_df is None:
+            return pd.DataFrame()
+        return self._history_df
+    
     def get_statistics(self) -> Dict:
         """获取统计信息"""
         try:
@@ -86,18 +259,23 @@ class DataHandler:
             if df.empty:
                 return {'total_trades': 0}
             
+            # 直接在底层numpy数组上归约，nan*函数与pandas跳过空值的语义一致
+            volume = df['volume'].to_numpy()
+            stock_codes = df['stock_code']
+            option_codes = df['option_code']
+            
             stats = {
                 'total_trades': len(df),
-                'unique_stocks': df['stock_code'].nunique(),
-                'unique_options': df['option_code'].nunique(),
-                'total_volume': df['volume'].sum(),
-                'total_turnover': df['turnover'].sum(),
-                'avg_trade_size': df['volume'].mean(),
+                'unique_stocks': pd.unique(stock_codes[stock_codes.notna()]).size,
+                'unique_options': pd.unique(option_codes[option_codes.notna()]).size,
+                'total_volume': np.nansum(volume),
+                'total_turnover': np.nansum(df['turnover'].to_numpy()),
+                'avg_trade_size': np.nanmean(volume),
                 'latest_trade_time': df['timestamp'].max().strftime('%Y-%m-%d %H:%M:%S')
             }
             
             return stats
             
         except Exception as e:
-            self.logger.error(f"获取统计信息失败: {e}")
+            self.logger.error("获取统计信息失败: %s", e)
             return {'error': str(e)}
\ No newline at end of file
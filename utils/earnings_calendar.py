@@ -13,8 +13,46 @@ import datetime
 import sqlite3
 import os
 import random
+import operator
+from contextlib import closing
 from typing import List, Dict, Any, Optional
 
+# SQL语句与参数提取器（模块加载时构建一次）
+_CREATE_TABLE_SQL = '''
+CREATE TABLE IF NOT EXISTS earnings_calendar (
+    stock_code TEXT,
+    stock_name TEXT,
+    report_date TEXT,
+    fiscal_period TEXT,
+    update_time TEXT,
+    PRIMARY KEY (stock_code, report_date)
+)
+'''
+
+_EARNINGS_FIELDS = ('stock_code', 'stock_name', 'report_date', 'fiscal_period', 'update_time')
+
+_EARNINGS_KEY_FIELDS = ('stock_code', 'report_date')
+
+# 主键冲突时用本次数据覆盖（同一股票同一日期重复生成时不再整批失败）
+_INSERT_SQL = f'''
+INSERT INTO earnings_calendar 
+({', '.join(_EARNINGS_FIELDS)})
+VALUES ({', '.join('?' * len(_EARNINGS_FIELDS))})
+ON CONFLICT ({', '.join(_EARNINGS_KEY_FIELDS)}) DO UPDATE SET
+{', '.join(f'{f} = excluded.{f}' for f in _EARNINGS_FIELDS if f not in _EARNINGS_KEY_FIELDS)}
+'''
+
+_UPCOMING_SQL = '''
+SELECT stock_code, stock_name, report_date, fiscal_period FROM earnings_calendar 
+WHERE report_date BETWEEN ? AND ?
+ORDER BY report_date ASC
+'''
+
+_LAST_UPDATE_SQL = 'SELECT update_time FROM earnings_calendar ORDER BY update_time DESC LIMIT 1'
+
+# 从财报字典中按列顺序取出插入参数
+_earnings_params = operator.itemgetter(*_EARNINGS_FIELDS)
+
 class EarningsCalendar:
     """港股财报日期获取器"""
     
@@ -27,25 +65,12 @@ class EarningsCalendar:
     def _init_db(self):
         """初始化数据库"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 创建财报日期表
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS earnings_calendar (
-                stock_code TEXT,
-                stock_name TEXT,
-                report_date TEXT,
-                fiscal_period TEXT,
-                update_time TEXT,
-                PRIMARY KEY (stock_code, report_date)
-            )
-            ''')
-            
-            conn.commit()
-            conn.close()
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                # 创建财报日期表
+                with conn:
+                    conn.execute(_CREATE_TABLE_SQL)
         except Exception as e:
-            self.logger.error(f"初始化数据库失败: {e}")
+            self.logger.error("初始化数据库失败: %s", e)
     
     def update_earnings_calendar(self) -> bool:
         """
@@ -137,34 +162,20 @@ class EarningsCalendar:
                         "update_time": now.strftime('%Y-%m-%d %H:%M:%S')
                     })
             
-            # 保存到数据库
-            conn = sqlite3.connect(self.db_path)
-            
-            # 清空旧数据
-            conn.execute("DELETE FROM earnings_calendar")
-            
-            # 插入新数据
-            for item in earnings_data:
-                conn.execute('''
-                INSERT INTO earnings_calendar 
-                (stock_code, stock_name, report_date, fiscal_period, update_time)
-                VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    item["stock_code"], 
-                    item["stock_name"], 
-                    item["report_date"], 
-                    item["fiscal_period"], 
-                    item["update_time"]
-                ))
-            
-            conn.commit()
-            conn.close()
+            # 保存到数据库（同一事务，失败时回滚）
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                with conn:
+                    # 清空旧数据
+                    conn.execute("DELETE FROM earnings_calendar")
+                    
+                    # 批量插入新数据
+                    conn.executemany(_INSERT_SQL, [_earnings_params(item) for item in earnings_data])
             
-            self.logger.info(f"成功生成 {len(earnings_data)} 条模拟港股财报日期数据")
+            self.logger.info("成功生成 %s 条模拟港股财报日期数据", len(earnings_data))
             return True
             
         except Exception as e:
-            self.logger.error(f"更新财报日期失败: {e}")
+            self.logger.error("更新财报日期失败: %s", e)
             return False
     
     def get_upcoming_earnings(self, days: int = 30) -> List[Dict[str, Any]]:
@@ -178,57 +189,45 @@ class EarningsCalendar:
             List[Dict]: 财报信息列表
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            
             # 计算日期范围
             now = datetime.datetime.now()
             end_date = (now + datetime.timedelta(days=days)).strftime('%Y-%m-%d')
             now_str = now.strftime('%Y-%m-%d')
             
             # 查询数据
-            cursor = conn.execute('''
-            SELECT * FROM earnings_calendar 
-            WHERE report_date BETWEEN ? AND ?
-            ORDER BY report_date ASC
-            ''', (now_str, end_date))
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                rows = conn.execute(_UPCOMING_SQL, (now_str, end_date)).fetchall()
             
             # 转换为字典列表
             results = []
-            for row in cursor:
-                report_date = datetime.datetime.strptime(row['report_date'], '%Y-%m-%d')
+            for stock_code, stock_name, report_date_str, fiscal_period in rows:
+                report_date = datetime.datetime.strptime(report_date_str, '%Y-%m-%d')
                 days_remaining = (report_date - now).days
                 
                 results.append({
-                    'stock_code': row['stock_code'],
-                    'stock_name': row['stock_name'],
-                    'report_date': row['report_date'],
-                    'fiscal_period': row['fiscal_period'],
+                    'stock_code': stock_code,
+                    'stock_name': stock_name,
+                    'report_date': report_date_str,
+                    'fiscal_period': fiscal_period,
                     'days_remaining': days_remaining
                 })
             
-            conn.close()
             return results
             
         except Exception as e:
-            self.logger.error(f"获取即将发布财报的港股失败: {e}")
+            self.logger.error("获取即将发布财报的港股失败: %s", e)
             return []
     
     def get_last_update_time(self) -> Optional[str]:
         """获取最后更新时间"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT update_time FROM earnings_calendar ORDER BY update_time DESC LIMIT 1')
-            result = cursor.fetchone()
-            
-            conn.close()
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                result = conn.execute(_LAST_UPDATE_SQL).fetchone()
             
             if result:
                 return result[0]
             return None
             
         except Exception as e:
-            self.logger.error(f"获取最后更新时间失败: {e}")
+            self.logger.error("获取最后更新时间失败: %s", e)
             return None
\ No newline at end of file
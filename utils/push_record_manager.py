@@ -5,6 +5,7 @@
 
 import os
 import json
+import time
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Set, Any, Optional
@@ -23,7 +24,7 @@ class PushRecordManager:
         self.logger = logging.getLogger('OptionMonitor.PushRecordManager')
         self.record_file = record_file
         self.pushed_records = set()  # 已推送的记录ID集合
-        self.last_load_time = None   # 上次加载时间
+        self.last_load_time = None   # 上次加载时间(time.monotonic)
         
         # 确保目录存在
         os.makedirs(os.path.dirname(record_file), exist_ok=True)
@@ -43,12 +44,12 @@ class PushRecordManager:
                 self.logger.info(f"推送记录文件不存在，将创建新文件: {self.record_file}")
                 self.pushed_records = set()
             
-            self.last_load_time = datetime.now()
+            self.last_load_time = time.monotonic()
             
         except Exception as e:
             self.logger.error(f"加载推送记录失败: {e}")
             self.pushed_records = set()
-            self.last_load_time = datetime.now()
+            self.last_load_time = time.monotonic()
     
     def _save_records(self):
         """保存已推送记录"""
@@ -78,7 +79,7 @@ class PushRecordManager:
             bool: 是否已推送
         """
         # 如果上次加载时间超过10分钟，重新加载记录
-        if self.last_load_time and (datetime.now() - self.last_load_time).seconds > 600:
+        if self.last_load_time is not None and time.monotonic() - self.last_load_time > 600:
             self._load_records()
         
         return option_id in self.pushed_records
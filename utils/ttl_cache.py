@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+带过期时间的函数结果缓存
+"""
+
+import time
+import threading
+import functools
+
+
+def ttl_cache(seconds: float = 5):
+    """
+    缓存函数返回值，超过 seconds 秒后重新计算
+
+    Args:
+        seconds: 缓存有效期(秒)
+    """
+    def decorator(func):
+        cache = {}  # key -> (过期时间, 返回值)
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+
+            with lock:
+                entry = cache.get(key)
+                if entry is not None and entry[0] > now:
+                    return entry[1]
+
+            value = func(*args, **kwargs)
+
+            with lock:
+                # 顺带清理已过期条目，避免参数不断变化时缓存无限增长
+                for k in [k for k, (expiry, _) in cache.items() if expiry <= now]:
+                    del cache[k]
+                cache[key] = (now + seconds, value)
+            return value
+
+        return wrapper
+
+    return decorator
@@ -11,12 +11,14 @@ import logging
 import os
 import traceback
 import sys
+import threading
 from datetime import datetime
 from option_monitor import OptionMonitor
 from utils.data_handler import DataHandler
 from utils.big_options_processor import BigOptionsProcessor
 from utils.earnings_calendar import EarningsCalendar
 from utils.push_record_manager import PushRecordManager
+from utils.ttl_cache import ttl_cache
 from config import WEB_CONFIG, NOTIFICATION, LOG_CONFIG
 
 # 配置日志
@@ -61,6 +63,7 @@ except ImportError:
 
 app = Flask(__name__)
 monitor = None
+monitor_lock = threading.Lock()  # 防止并发请求重复创建监控器
 data_handler = DataHandler()
 big_options_processor = BigOptionsProcessor()
 # logger已在上面通过setup_logger()初始化
@@ -78,6 +81,25 @@ stock_price_cache_time = {}  # 股票代码 -> 缓存时间
 # 初始化推送记录管理器
 push_record_manager = PushRecordManager()
 
+# 读取 data/stock_prices.json（短时缓存，避免同一请求内及频繁轮询时重复读盘解析）
+def load_stock_prices():
+    """返回 stock_prices.json 中的 prices 字典，文件不存在或格式不符时返回空字典"""
+    sp_path = os.path.join('data', 'stock_prices.json')
+    try:
+        st = os.stat(sp_path)
+    except OSError:
+        return {}
+    # 以文件修改时间和大小作为缓存键，监控进程重写文件后立即读到新数据
+    return _read_stock_prices(sp_path, st.st_mtime_ns, st.st_size)
+
+@ttl_cache(seconds=5)
+def _read_stock_prices(sp_path, mtime_ns, size):
+    """解析 stock_prices.json（mtime_ns/size 仅用于区分文件版本）"""
+    with open(sp_path, 'r', encoding='utf-8') as f:
+        sp = json.load(f)
+    prices = sp.get('prices') if isinstance(sp, dict) else None
+    return prices if isinstance(prices, dict) else {}
+
 # 获取股票价格（带缓存）
 def get_stock_price(stock_code, force_refresh=False):
     """获取股票价格，带缓存机制"""
@@ -211,17 +233,11 @@ def get_big_options_summary():
         # 也从 stock_prices.json 补齐名称，保持与摘要一致
         stock_name_map = {}
         try:
-            sp_path = os.path.join('data', 'stock_prices.json')
-            if os.path.exists(sp_path):
-                with open(sp_path, 'r', encoding='utf-8') as f:
-                    sp = json.load(f)
-                prices = sp.get('prices') if isinstance(sp, dict) else None
-                if isinstance(prices, dict):
-                    for code, info in prices.items():
-                        if isinstance(info, dict):
-                            name = info.get('name')
-                            if name:
-                                stock_name_map[code] = name
+            for code, info in load_stock_prices().items():
+                if isinstance(info, dict):
+                    name = info.get('name')
+                    if name:
+                        stock_name_map[code] = name
         except Exception as _e:
             logger.warning(f"读取stock_prices.json失败: {_e}")
 
@@ -239,18 +255,12 @@ def get_big_options_summary():
         # 从 data/stock_prices.json 读取股票名称映射，补齐 big_options 的 stock_name
         stock_name_map = {}
         try:
-            sp_path = os.path.join('data', 'stock_prices.json')
-            if os.path.exists(sp_path):
-                with open(sp_path, 'r', encoding='utf-8') as f:
-                    sp = json.load(f)
-                # 兼容结构: {"prices": {"HK.00700": {"price": 600, "name": "腾讯"}}}
-                prices = sp.get('prices') if isinstance(sp, dict) else None
-                if isinstance(prices, dict):
-                    for code, info in prices.items():
-                        if isinstance(info, dict):
-                            name = info.get('name')
-                            if name:
-                                stock_name_map[code] = name
+            # 兼容结构: {"prices": {"HK.00700": {"price": 600, "name": "腾讯"}}}
+            for code, info in load_stock_prices().items():
+                if isinstance(info, dict):
+                    name = info.get('name')
+                    if name:
+                        stock_name_map[code] = name
         except Exception as _e:
             logger.warning(f"读取stock_prices.json失败: {_e}")
 
@@ -267,15 +277,9 @@ def get_big_options_summary():
         # 读取 stock_prices.json 中的成交额，补充到 big_options 的 stock_turnover 字段
         try:
             stock_turnover_map = {}
-            sp_path = os.path.join('data', 'stock_prices.json')
-            if os.path.exists(sp_path):
-                with open(sp_path, 'r', encoding='utf-8') as f:
-                    sp = json.load(f)
-                prices = sp.get('prices') if isinstance(sp, dict) else None
-                if isinstance(prices, dict):
-                    for code, info in prices.items():
-                        if isinstance(info, dict) and ('turnover' in info):
-                            stock_turnover_map[code] = info.get('turnover')
+            for code, info in load_stock_prices().items():
+                if isinstance(info, dict) and ('turnover' in info):
+                    stock_turnover_map[code] = info.get('turnover')
             if isinstance(big_options, list) and stock_turnover_map:
                 for opt in big_options:
                     if isinstance(opt, dict):
@@ -538,7 +542,9 @@ def start_monitor():
     
     try:
         if monitor is None:
-            monitor = OptionMonitor()
+            with monitor_lock:
+                if monitor is None:
+                    monitor = OptionMonitor()
         
         monitor.start_monitoring()
         return jsonify({'success': True, 'message': '监控已启动'})
@@ -595,17 +601,11 @@ def force_push():
         # 从 data/stock_prices.json 补齐股票名称
         try:
             stock_name_map = {}
-            sp_path = os.path.join('data', 'stock_prices.json')
-            if os.path.exists(sp_path):
-                with open(sp_path, 'r', encoding='utf-8') as f:
-                    sp = json.load(f)
-                prices = sp.get('prices') if isinstance(sp, dict) else None
-                if isinstance(prices, dict):
-                    for code, info in prices.items():
-                        if isinstance(info, dict):
-                            nm = info.get('name')
-                            if nm:
-                                stock_name_map[code] = nm
+            for code, info in load_stock_prices().items():
+                if isinstance(info, dict):
+                    nm = info.get('name')
+                    if nm:
+                        stock_name_map[code] = nm
             if isinstance(big_options, list) and stock_name_map:
                 for opt in big_options:
                     if isinstance(opt, dict):